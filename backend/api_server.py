@@ -1,24 +1,45 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import asyncio
+import hashlib
+import logging
 import uvicorn
 from pathlib import Path
+from collections import deque
 from client1 import TaskAssistantAgent
+from file_lock import locked
+from llm_cache import LLMCache
 import os
-import json
+import sys
+import orjson
 from datetime import datetime
 from dotenv import load_dotenv
 
-app = FastAPI(title="TaskFlow AI API")
+app = FastAPI(title="TaskFlow AI API", default_response_class=ORJSONResponse)
 
 load_dotenv()
 frontend_path = os.getenv("FRONTEND_PATH")
 
-# Notification storage file
-NOTIFICATIONS_FILE = Path(__file__).parent / "notifications.json"
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
+logger = logging.getLogger(__name__)
+
+# Frontend page, read once at startup and served from memory
+HTML_FILE = Path(frontend_path) if frontend_path else Path(__file__).parent.parent / "chatbot.html"
+_html = None
+_html_etag = None
+
+# Notification journal written by server_notif.py (one JSON object per line)
+NOTIFICATIONS_FILE = Path(__file__).parent / "notifications.jsonl"
+NOTIFICATIONS_LOCK_FILE = NOTIFICATIONS_FILE.with_suffix(".jsonl.lock")
+MAX_NOTIFICATIONS = 100
+
+# Parsed notifications, re-read only when server_notif.py rewrites the file
+_notifications = []
+_notifications_stamp = None
+_notifications_lock = asyncio.Lock()
 
 
 # Enable CORS for local development
@@ -30,9 +51,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Constant typing-indicator frames, encoded once. Sent as text because the
+# frontend JSON.parse()s event.data and binary frames arrive as a Blob.
+TYPING_START = orjson.dumps({"type": "typing", "status": "started"}).decode()
+
+# Seconds to wait for the agent before showing the typing indicator
+TYPING_DELAY = 0.1
+
 # Initialize the agent (will be done on startup)
 agent = None
 
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 1024))
+
+# Each worker runs its own agent; see the __main__ block. The response cache
+# lives in one process, so while it is enabled the default is a single worker.
+UVICORN_WORKERS = int(os.getenv("UVICORN_WORKERS", 1 if LLM_CACHE_SIZE > 0 else os.cpu_count() or 4))
+
+# Agent responses for repeated read-only prompts. With several workers a change
+# made through one worker could not invalidate the others, so the cache is
+# disabled (size 0) in that case.
+response_cache = LLMCache(
+    maxsize=LLM_CACHE_SIZE if UVICORN_WORKERS == 1 else 0,
+    ttl=float(os.getenv("LLM_CACHE_TTL", 300))
+)
+
+# Agent runs already in flight, keyed like the cache so identical prompts share one
+inflight_requests = {}
+
 
 class MessageRequest(BaseModel):
     message: str
@@ -46,7 +91,17 @@ class MessageResponse(BaseModel):
 @app.on_event("startup")
 async def startup_event():
     """Initialize the agent when server starts"""
-    global agent
+    global agent, _html, _html_etag
+    if HTML_FILE.exists():
+        _html = HTML_FILE.read_bytes()
+        _html_etag = f'"{hashlib.md5(_html).hexdigest()}"'
+    
+    if UVICORN_WORKERS > 1 and LLM_CACHE_SIZE > 0:
+        logger.warning(
+            "LLM response cache disabled: it is per process and UVICORN_WORKERS=%d",
+            UVICORN_WORKERS
+        )
+    
     print("🚀 Initializing TaskFlow AI Agent...")
     agent = TaskAssistantAgent()
     await agent.setup()
@@ -62,19 +117,53 @@ async def shutdown_event():
     print("👋 Agent shutdown complete")
 
 
+async def run_agent(message: str):
+    """Run the agent, answering repeated read-only prompts from the cache."""
+    key = response_cache.key(message)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Share an identical run already in flight, but only keep its answer if it
+    # was read-only; a run that changed state must not stand in for this one
+    shared = inflight_requests.get(key)
+    if shared is not None:
+        # Shield so one client disconnecting doesn't cancel the shared run
+        response, tools_called = await asyncio.shield(shared)
+        if response_cache.is_cacheable(tools_called):
+            return response
+
+    generation = response_cache.generation
+    task = asyncio.create_task(agent.run_with_tools(message))
+    if key not in inflight_requests:
+        inflight_requests[key] = task
+        task.add_done_callback(lambda _: inflight_requests.pop(key, None))
+    response, tools_called = await asyncio.shield(task)
+
+    # Whether the answer can be reused depends on the tools the agent actually called
+    if not response_cache.is_cacheable(tools_called):
+        # State changed, so earlier answers may be stale
+        response_cache.clear()
+    elif response_cache.generation == generation:
+        response_cache.set(key, response)
+    return response
+
+
 @app.get("/", response_class=HTMLResponse)
-async def get_home():
+async def get_home(request: Request):
     """Serve the HTML frontend"""
 
-    html_file = Path(r"E:\MCP\Smart Task Assistant\chatbot.html")
-
-    if not html_file.exists():
+    if _html is None:
         return HTMLResponse(
             content="<h1>Frontend file not found</h1>",
             status_code=404
         )
 
-    return html_file.read_text(encoding="utf-8")
+    headers = {"ETag": _html_etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == _html_etag:
+        return Response(status_code=304, headers=headers)
+
+    return HTMLResponse(content=_html, headers=headers)
 
 
 @app.post("/api/chat")
@@ -84,8 +173,7 @@ async def chat(request: MessageRequest):
         return {"error": "Agent not initialized"}
     
     try:
-        response = await agent.run(request.message)
-        from datetime import datetime
+        response = await run_agent(request.message)
         return MessageResponse(
             response=response,
             timestamp=datetime.now().isoformat()
@@ -98,48 +186,43 @@ async def chat(request: MessageRequest):
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time chat"""
     await websocket.accept()
-    print("✅ WebSocket client connected")
+    logger.debug("WebSocket client connected")
     
     try:
         while True:
             # Receive message from frontend
             data = await websocket.receive_text()
-            print(f"📨 Received: {data}")
+            logger.debug("Received: %s", data)
             
-            # Send typing indicator
-            await websocket.send_json({
-                "type": "typing",
-                "status": "started"
-            })
+            # Process message through agent, only showing the typing
+            # indicator if it doesn't answer almost immediately
+            task = asyncio.create_task(run_agent(data))
+            done, _ = await asyncio.wait({task}, timeout=TYPING_DELAY)
+            if not done:
+                await websocket.send_text(TYPING_START)
             
             try:
-                # Process message through agent
-                response = await agent.run(data)
+                response = await task
                 
-                # Send response back
-                await websocket.send_json({
+                # Send response back; the same frame stops the typing indicator
+                await websocket.send_text(orjson.dumps({
                     "type": "message",
                     "response": response,
+                    "typing": "stopped",
                     "timestamp": asyncio.get_event_loop().time()
-                })
+                }).decode())
                 
             except Exception as e:
-                await websocket.send_json({
+                # The frontend hides the typing indicator on errors too
+                await websocket.send_text(orjson.dumps({
                     "type": "error",
                     "error": str(e)
-                })
-            
-            finally:
-                # Stop typing indicator
-                await websocket.send_json({
-                    "type": "typing",
-                    "status": "stopped"
-                })
+                }).decode())
                 
     except WebSocketDisconnect:
-        print("👋 WebSocket client disconnected")
+        logger.debug("WebSocket client disconnected")
     except Exception as e:
-        print(f"❌ WebSocket error: {e}")
+        logger.warning("WebSocket error: %s", e)
 
 
 @app.get("/health")
@@ -152,36 +235,73 @@ async def health_check():
 
 
 # Notification API Endpoints
-def load_notifications():
-    """Load notifications from file"""
-    if NOTIFICATIONS_FILE.exists():
+def read_notifications_file():
+    """Read and parse the notifications journal, newest first"""
+    try:
+        with open(NOTIFICATIONS_FILE, 'rb') as f:
+            lines = deque(f, maxlen=MAX_NOTIFICATIONS)
+    except OSError:
+        return []
+
+    notifications = []
+    for line in reversed(lines):
         try:
-            with open(NOTIFICATIONS_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+            entry = orjson.loads(line)
+        except ValueError:
+            continue  # Skip a blank or partially written line
+        # Skip anything that isn't a notification object, like a legacy "[]"
+        if isinstance(entry, dict):
+            notifications.append(entry)
+    return notifications
+
+
+def clear_notifications_file():
+    """Empty the journal under the same lock the notification servers write with"""
+    with locked(NOTIFICATIONS_LOCK_FILE):
+        NOTIFICATIONS_FILE.write_text("")
+
+
+async def load_notifications():
+    """Load notifications, using the cached copy while the file is unchanged"""
+    global _notifications, _notifications_stamp
+    async with _notifications_lock:
+        try:
+            # Size as well as mtime: an append within the same timestamp tick
+            # still grows the append-only journal
+            st = NOTIFICATIONS_FILE.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            _notifications, _notifications_stamp = [], None
+            return _notifications
+
+        if stamp != _notifications_stamp:
+            _notifications = await asyncio.to_thread(read_notifications_file)
+            _notifications_stamp = stamp
+        return _notifications
 
 
 @app.get("/api/notifications")
 async def get_notifications():
     """Get all notifications"""
-    notifications = load_notifications()
+    notifications = await load_notifications()
     return notifications
 
 
 @app.delete("/api/notifications")
 async def clear_notifications():
     """Clear all notifications"""
-    if NOTIFICATIONS_FILE.exists():
-        NOTIFICATIONS_FILE.write_text("[]")
+    global _notifications, _notifications_stamp
+    async with _notifications_lock:
+        if NOTIFICATIONS_FILE.exists():
+            await asyncio.to_thread(clear_notifications_file)
+        _notifications, _notifications_stamp = [], None
     return {"success": True, "message": "Notifications cleared"}
 
 
 @app.get("/api/notifications/status")
 async def get_notification_status():
     """Get notification system status"""
-    notifications = load_notifications()
+    notifications = await load_notifications()
     return {
         "status": "connected",
         "count": len(notifications),
@@ -197,9 +317,14 @@ if __name__ == "__main__":
     print("📍 API Docs: http://localhost:8000/docs")
     print("=" * 60)
     
+    # Workers need the app as an import string; each one runs its own agent
     uvicorn.run(
-        app,
+        "api_server:app",
         host="0.0.0.0",
         port=8000,
-        log_level="info"
+        workers=UVICORN_WORKERS,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        log_level="warning",
+        access_log=False
     )
\ No newline at end of file
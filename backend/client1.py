@@ -1,13 +1,18 @@
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
 from langgraph.prebuilt import create_react_agent
 from langgraph.graph import StateGraph, MessagesState, START, END
 from langgraph.prebuilt import ToolNode
+from langgraph.types import CachePolicy
+from langgraph.cache.memory import InMemoryCache
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import SystemMessage
 from dotenv import load_dotenv
+from contextlib import AsyncExitStack
 import asyncio
 import os
 import sys
+import threading
 
 load_dotenv()
 
@@ -16,6 +21,7 @@ SYSTEM_PROMPT = """You are a helpful and friendly task management assistant. You
 
 When the user asks to do something with their tasks, analyze their intent and call the appropriate function:
 - add_task: When they want to create a new task or reminder
+- add_tasks: When they want to create several tasks at once
 - list_tasks: When they want to see their tasks
 - complete_task: When they want to mark a task as done (make sure you have the task ID)
 - delete_task: When they want to remove a task
@@ -33,6 +39,57 @@ If you need more information (like a task ID or notification details), ask the u
 
 Keep your responses concise but helpful. Use emojis occasionally to make the interaction more engaging."""
 
+# Built once and shared by every conversation (each run starts a fresh state)
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+# Seconds a cached model turn stays valid
+MODEL_CACHE_TTL = 300
+
+
+def model_cache_key(state: MessagesState):
+    """Key a model turn on message roles, contents and tool calls, ignoring generated ids."""
+    return repr([
+        (msg.type, msg.content, [(call["name"], call["args"]) for call in getattr(msg, "tool_calls", None) or []])
+        for msg in state["messages"]
+    ])
+
+
+async def read_line(prompt: str):
+    """
+    Read one line from stdin without blocking the event loop.
+    
+    The read happens on a daemon thread using the raw file descriptor, so a
+    pending read neither keeps the process alive after Ctrl+C nor trips over
+    sys.stdin's buffer lock at interpreter shutdown.
+    
+    Returns:
+        The line read, or None at end of input
+    """
+    print(prompt, end="", flush=True)
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(data):
+        if not future.done():
+            future.set_result(data)
+    
+    def read():
+        # Byte at a time so input after the newline stays unread for the next call
+        data = b""
+        while not data.endswith(b"\n"):
+            byte = os.read(sys.stdin.fileno(), 1)
+            if not byte:
+                break
+            data += byte
+        try:
+            loop.call_soon_threadsafe(resolve, data)
+        except RuntimeError:
+            pass  # The loop already closed
+    
+    threading.Thread(target=read, daemon=True).start()
+    data = await future
+    return data.decode(errors="replace") if data else None
+
 
 class TaskAssistantAgent:
     """
@@ -41,6 +98,7 @@ class TaskAssistantAgent:
     
     def __init__(self):
         self.client = None
+        self.sessions = None
         self.graph = None
         self.model = None
         
@@ -111,7 +169,13 @@ class TaskAssistantAgent:
         
         print("🔍 Loading tools from MCP server...")
         try:
-            tools = await self.client.get_tools()
+            # Keep one session per server open so tool calls reuse the running
+            # subprocess instead of spawning a new one for every call
+            self.sessions = AsyncExitStack()
+            tools = []
+            for server_name in self.client.connections:
+                session = await self.sessions.enter_async_context(self.client.session(server_name))
+                tools.extend(await load_mcp_tools(session))
             print(f"✅ Loaded {len(tools)} tools from MCP servers")
             
             # Print available tools
@@ -147,20 +211,20 @@ class TaskAssistantAgent:
         # Define the model calling function
         async def call_model(state: MessagesState):
             """Call the language model with the current state."""
-            messages = state["messages"]
-            
-            # Add system prompt if this is the first turn
-            if not any(isinstance(msg, SystemMessage) for msg in messages):
-                messages = [SystemMessage(content=SYSTEM_PROMPT)] + messages
-            
-            response = await model_with_tools.ainvoke(messages)
+            # The system prompt is already the first message of the state
+            response = await model_with_tools.ainvoke(state["messages"])
             return {"messages": [response]}
         
         # Build the graph
         builder = StateGraph(MessagesState)
         
         # Add nodes
-        builder.add_node("call_model", call_model)
+        # Replayed conversations reuse the model turn; tools still run every time
+        builder.add_node(
+            "call_model",
+            call_model,
+            cache_policy=CachePolicy(key_func=model_cache_key, ttl=MODEL_CACHE_TTL)
+        )
         builder.add_node("tools", tool_node)
         
         # Add edges
@@ -169,9 +233,13 @@ class TaskAssistantAgent:
         builder.add_edge("tools", "call_model")
         
         # Compile the graph
-        self.graph = builder.compile()
+        self.graph = builder.compile(cache=InMemoryCache())
         
         print("✅ Agent setup complete!")
+    
+    def initial_state(self, user_input: str):
+        """Build the graph input for a new conversation, led by the system prompt."""
+        return {"messages": [SYSTEM_MESSAGE, ("user", user_input)]}
         
     async def run(self, user_input: str):
         """
@@ -183,23 +251,76 @@ class TaskAssistantAgent:
         Returns:
             The agent's response
         """
+        response_content, _ = await self.run_with_tools(user_input)
+        return response_content
+    
+    async def run_with_tools(self, user_input: str):
+        """
+        Process a user input through the agent, also reporting the tools it called.
+        
+        Args:
+            user_input: The user's message
+            
+        Returns:
+            A (response, tool names) tuple
+        """
         if not self.graph:
             raise RuntimeError("Agent not initialized. Call setup() first.")
         
         # Stream the agent's response
         response_content = ""
+        tools_called = set()
         async for event in self.graph.astream(
-            {"messages": [("user", user_input)]},
+            self.initial_state(user_input),
             stream_mode="values"
         ):
             # Get the last message
             last_message = event["messages"][-1]
             
+            # Record every tool the model asked for on the way
+            for call in getattr(last_message, 'tool_calls', None) or []:
+                tools_called.add(call["name"])
+            
             # If it's an AI message without tool calls, it's the final response
             if hasattr(last_message, 'content') and last_message.content:
                 response_content = last_message.content
         
-        return response_content
+        return response_content, tools_called
+    
+    async def stream(self, user_input: str):
+        """
+        Process a user input through the agent, yielding the reply as it is generated.
+        
+        Args:
+            user_input: The user's message
+            
+        Yields:
+            Chunks of the agent's response text
+        """
+        if not self.graph:
+            raise RuntimeError("Agent not initialized. Call setup() first.")
+        
+        streamed_ids = set()
+        final_message = None
+        async for mode, chunk in self.graph.astream(
+            self.initial_state(user_input),
+            stream_mode=["messages", "values"]
+        ):
+            if mode == "messages":
+                # Only forward model tokens, not tool results
+                message, metadata = chunk
+                if metadata.get("langgraph_node") == "call_model" and message.content:
+                    streamed_ids.add(message.id)
+                    yield message.content
+            else:
+                last_message = chunk["messages"][-1]
+                if last_message.type == "ai" and last_message.content:
+                    final_message = last_message
+        
+        # A cached model turn produces no tokens, so if the final answer wasn't
+        # streamed (even when an earlier turn was), emit it whole
+        if final_message is not None and final_message.id not in streamed_ids:
+            yield final_message.content
     
     async def run_interactive(self):
         """Run an interactive chat loop."""
@@ -209,7 +330,11 @@ class TaskAssistantAgent:
         
         while True:
             try:
-                user_input = input("You: ").strip()
+                user_input = await read_line("You: ")
+                if user_input is None:
+                    print("\n👋 Goodbye!")
+                    break
+                user_input = user_input.strip()
                 
                 if user_input.lower() in ['quit', 'exit', 'q']:
                     print("👋 Goodbye!")
@@ -218,11 +343,14 @@ class TaskAssistantAgent:
                 if not user_input:
                     continue
                 
-                # Get response from agent
-                response = await self.run(user_input)
-                print(f"\n🤖 Assistant: {response}\n")
+                # Print the response as the agent streams it
+                print("\n🤖 Assistant: ", end="", flush=True)
+                async for token in self.stream(user_input):
+                    print(token, end="", flush=True)
+                print("\n")
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                # asyncio.run turns Ctrl+C into a cancellation of this task
                 print("\n👋 Goodbye!")
                 break
             except Exception as e:
@@ -232,9 +360,10 @@ class TaskAssistantAgent:
     
     async def cleanup(self):
         """Clean up resources."""
-        if self.client:
-            # Close MCP client connections if needed
-            pass
+        if self.sessions:
+            # Close the MCP sessions and stop the server subprocesses
+            await self.sessions.aclose()
+            self.sessions = None
 
 
 async def main():
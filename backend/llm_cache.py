@@ -0,0 +1,57 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+# Tools that only read state; a run that called anything else changed tasks or
+# notifications, so its answer must not be reused
+READ_ONLY_TOOLS = frozenset({"list_tasks", "summarize_tasks", "tasks_by_date", "tasks_by_range"})
+
+
+class LLMCache:
+    """
+    Exact-match cache for agent responses, keyed by the normalized prompt.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Bumped on every clear, so runs that started earlier can't re-cache
+        self.generation = 0
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Lowercase and collapse whitespace so trivial variants share a key."""
+        return " ".join(message.lower().split())
+
+    def key(self, message: str) -> str:
+        normalized = self.normalize(message)
+        return hashlib.sha256(json.dumps({"msg": normalized}, sort_keys=True).encode()).hexdigest()
+
+    def is_cacheable(self, tools_called) -> bool:
+        """A run is reusable only if every tool it called was read-only."""
+        return READ_ONLY_TOOLS.issuperset(tools_called)
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: str):
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.generation += 1
@@ -1,50 +1,197 @@
+import asyncio
 import os
-from datetime import datetime
-from pymongo import MongoClient
+import sys
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pymongo import AsyncMongoClient, ReturnDocument
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-from dateparser import parse as date_parse
+from dateparser.date import DateDataParser
 from dateparser.search import search_dates
 from pymongo.server_api import ServerApi
+from timestamps import now_iso
 import re
-from datetime import datetime, timedelta  
 
 load_dotenv()
 
-server = FastMCP(name="SmartTaskAssistantServer")
-
-# MongoDB connection
+# MongoDB connection (async client so tool calls don't block the event loop)
 MONGO_URI = os.getenv("MONGO_URI")
-client = MongoClient(MONGO_URI,server_api=ServerApi('1'))
+client = AsyncMongoClient(
+    MONGO_URI,
+    server_api=ServerApi('1'),
+    maxPoolSize=50,
+    minPoolSize=5,
+    serverSelectionTimeoutMS=2000,
+    connectTimeoutMS=2000,
+    socketTimeoutMS=5000,
+    compressors="zstd,zlib",
+    retryWrites=True
+)
 db = client["TaskAssistant"]
 tasks_collection = db["tasks"]
+counters_collection = db["counters"]
+
+ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Most common relative words, answered without any regex or dateparser work
+RELATIVE_DAY_OFFSETS = {"today": 0, "tomorrow": 1, "yesterday": -1}
+
+# Map weekday names to numbers
+WEEKDAY_MAP = {
+    'monday': 0, 'mon': 0,
+    'tuesday': 1, 'tue': 1, 'tues': 1,
+    'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+    'friday': 4, 'fri': 4,
+    'saturday': 5, 'sat': 5,
+    'sunday': 6, 'sun': 6
+}
+
+# Days to add for [current weekday][target weekday], Monday=0 ... Sunday=6
+NEXT_WEEKDAY_OFFSETS = [
+    [(target - current) % 7 or 7 for target in range(7)]
+    for current in range(7)
+]
+THIS_WEEKDAY_OFFSETS = [
+    [target - current if target >= current else (7 - current) + target for target in range(7)]
+    for current in range(7)
+]
+# Days to this week's Friday, or next Friday from Saturday/Sunday
+END_WEEK_OFFSETS = [4 - current if current <= 4 else (7 - current) + 4 for current in range(7)]
+
+# One pass over the input decides which relative-date rule applies; the
+# leftmost match wins, so "end of next week" isn't read as "next week"
+_WEEKDAY_NAMES = '|'.join(WEEKDAY_MAP)
+DATE_PHRASE_PATTERN = re.compile(
+    r'(?P<end_next_week>\bend of next week\b)'
+    r'|(?P<end_week>\bend of (?:this )?week\b)'
+    r'|(?P<next_week>\b(?:next week|beginning of next week|start of next week)\b)'
+    r'|(?P<this_week>\b(?:this week|beginning of this week|start of this week)\b)'
+    r'|(?P<in_weeks>\bin (?P<num_weeks>\d+) weeks?\b)'
+    r'|(?P<next_day>\bnext (?P<next_day_name>' + _WEEKDAY_NAMES + r')\b)'
+    r'|(?P<this_day>\bthis (?P<this_day_name>' + _WEEKDAY_NAMES + r')\b)'
+)
+
+# due_date is stored as a BSON date; reads render it back as YYYY-MM-DD
+TASK_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "title": 1,
+    "done": 1,
+    "created_at": 1,
+    "completed_at": 1,
+    "due_date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$due_date"}},
+}
+
+# Same, without created_at/completed_at, for listings that don't need them
+TASK_LIST_PROJECTION = {
+    field: value for field, value in TASK_PROJECTION.items()
+    if field not in ("created_at", "completed_at")
+}
+
+# Built once: constructing a parser loads locale data and compiles its regexes.
+# No RELATIVE_BASE or TIMEZONE, so relative dates resolve against the current
+# local time, matching the local date.today() used by the fast paths and cache key.
+DATE_PARSER = DateDataParser(
+    languages=['en'],
+    settings={
+        'PREFER_DATES_FROM': 'future',
+    }
+)
+
+async def _warm_pool():
+    """Warm the pool so the first tool call doesn't pay the TLS/auth handshake."""
+    await client.admin.command('ping')
+
+
+async def _ensure_task_counter():
+    """Seed the tasks counter from the current max id (idempotent)."""
+    last_task = await tasks_collection.find_one(
+        filter={"id": {"$exists": True}},
+        sort=[("id", -1)],
+        projection={"id": 1, "_id": 0}
+    )
+    current_max = last_task["id"] if last_task and "id" in last_task else 0
+    # $max never lowers the counter, so restarts can't hand out a used id
+    await counters_collection.update_one(
+        {"_id": "tasks"},
+        {"$max": {"seq": current_max}},
+        upsert=True
+    )
 
-"""try:
-    client.admin.command('ping')
-    print("Pinged your deployment. You successfully connected to MongoDB!")
-except Exception as e:
-    print(e)"""
-    
 
-def get_next_task_id():
-    """Generate the next task ID based on existing tasks."""
+async def _migrate_due_dates():
+    """Convert legacy "YYYY-MM-DD" due_date strings to BSON dates (idempotent)."""
+    await tasks_collection.update_many(
+        {"due_date": {"$type": "string"}},
+        [{"$set": {"due_date": {"$dateFromString": {
+            "dateString": "$due_date",
+            "format": "%Y-%m-%d",
+            "onError": None
+        }}}}]
+    )
+
+
+TASK_INDEXES = [
+    # Unique ids; legacy documents without an id are left out of the index
+    ([("id", 1)], {"unique": True, "partialFilterExpression": {"id": {"$exists": True}}}),
+    # Serves due_date lookups and tasks_by_range's (due_date, id) ordering
+    ([("due_date", 1), ("id", 1)], {}),
+    # Serves summarize_tasks' pending/overdue matches
+    ([("done", 1), ("due_date", 1)], {}),
+]
+
+
+async def _ensure_indexes():
+    """Create the indexes used by id lookups and date queries (idempotent)."""
+    # One at a time, so e.g. duplicate legacy ids failing the unique build
+    # don't keep the date indexes from being created
+    for keys, options in TASK_INDEXES:
+        try:
+            await tasks_collection.create_index(keys, **options)
+        except Exception as e:
+            print(f"⚠️ Could not create index {keys}: {e}", file=sys.stderr)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Run the one-time MongoDB setup inside the server's event loop."""
+    # Each step runs on its own so one failure doesn't skip the due-date migration.
+    # stdout carries the MCP stdio protocol, so problems are reported on stderr.
+    for step in (_warm_pool, _ensure_task_counter, _migrate_due_dates, _ensure_indexes):
+        try:
+            await step()
+        except Exception as e:
+            print(f"⚠️ MongoDB startup step {step.__name__} failed: {e}", file=sys.stderr)
+    yield
+
+
+server = FastMCP(name="SmartTaskAssistantServer", lifespan=lifespan)
+
+
+async def reserve_task_ids(count: int):
+    """Reserve `count` consecutive task IDs in one atomic increment; returns the first."""
+    counter = await counters_collection.find_one_and_update(
+        {"_id": "tasks"},
+        {"$inc": {"seq": count}},
+        projection={"seq": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"] - count + 1
+
+
+async def get_next_task_id():
+    """Generate the next task ID with a single atomic counter increment."""
     try:
-        # Only find documents that HAVE an 'id' field
-        last_task = tasks_collection.find_one(
-            filter={"id": {"$exists": True}},  # ← CRITICAL: Only get docs with 'id'
-            sort=[("id", -1)],
-            projection={"id": 1, "_id": 0}  # Only return the 'id' field
-        )
-        
-        if last_task and "id" in last_task:  # ← Double-check 'id' exists
-            return last_task["id"] + 1
-        else:
-            return 1  # No valid tasks found
-            
+        return await reserve_task_ids(1)
+
     except Exception as e:
-        print(f"⚠️ Error: {e}")
-        # Fallback: count documents and add 1
-        return tasks_collection.count_documents({}) + 1
+        # stdout carries the MCP stdio protocol. No count-based fallback: after
+        # a delete it would reuse an id and hit the unique index anyway.
+        print(f"⚠️ Could not reserve a task id: {e}", file=sys.stderr)
+        raise
 
 """
 def parse_due_date(date_string: str):
@@ -73,6 +220,59 @@ def parse_due_date(date_string: str):
     return None
 """
 
+def _next_week(match, now, current_weekday):
+    """"next week" → Monday of next week"""
+    return now + timedelta(days=7 - current_weekday)
+
+
+def _end_next_week(match, now, current_weekday):
+    """"end of next week" → Friday of next week"""
+    return now + timedelta(days=7 - current_weekday + 4)  # Monday + 4 = Friday
+
+
+def _this_week(match, now, current_weekday):
+    """"this week" → Monday of the current week"""
+    return now - timedelta(days=current_weekday)
+
+
+def _end_week(match, now, current_weekday):
+    """"end of (this) week" → Friday, or next Friday on weekends"""
+    return now + timedelta(days=END_WEEK_OFFSETS[current_weekday])
+
+
+def _in_weeks(match, now, current_weekday):
+    """"in X weeks" → X weeks from today"""
+    return now + timedelta(weeks=int(match.group("num_weeks")))
+
+
+def _next_day(match, now, current_weekday):
+    """"next <weekday>" → next occurrence of that weekday, never today"""
+    day_num = WEEKDAY_MAP[match.group("next_day_name")]
+    return now + timedelta(days=NEXT_WEEKDAY_OFFSETS[current_weekday][day_num])
+
+
+def _this_day(match, now, current_weekday):
+    """"this <weekday>" → this week's occurrence, today, or next week's if passed"""
+    day_num = WEEKDAY_MAP[match.group("this_day_name")]
+    return now + timedelta(days=THIS_WEEKDAY_OFFSETS[current_weekday][day_num])
+
+
+DATE_PHRASE_HANDLERS = {
+    "next_week": _next_week,
+    "end_next_week": _end_next_week,
+    "this_week": _this_week,
+    "end_week": _end_week,
+    "in_weeks": _in_weeks,
+    "next_day": _next_day,
+    "this_day": _this_day,
+}
+
+
+def format_due_date(value: datetime):
+    """Render a datetime as the "YYYY-MM-DD" string used in responses"""
+    return value.date().isoformat()
+
+
 def parse_due_date(date_string: str):
     """
     Enhanced date parsing with intelligent week handling.
@@ -85,116 +285,73 @@ def parse_due_date(date_string: str):
     - "beginning of next week" → Monday of next week
     
     Also supports all standard dateparser formats.
+    Returns the "YYYY-MM-DD" form of parse_due_datetime (or None).
     """
+    parsed_due = parse_due_datetime(date_string)
+    return format_due_date(parsed_due) if parsed_due else None
+
+
+def parse_due_datetime(date_string: str):
+    """Parse a due date into the midnight datetime used in MongoDB (or None)"""
     if not date_string:
         return None
     
+    # Fast path: already a valid YYYY-MM-DD date, no parsing needed
+    stripped = date_string.strip()
+    if ISO_DATE_PATTERN.fullmatch(stripped):
+        try:
+            return datetime.strptime(stripped, "%Y-%m-%d")
+        except ValueError:
+            pass
+    
+    today = date.today()
+    day_offset = RELATIVE_DAY_OFFSETS.get(stripped.lower())
+    if day_offset is not None:
+        return datetime.combine(today + timedelta(days=day_offset), datetime.min.time())
+    
+    # Keyed on today's date so relative inputs ("tomorrow") roll over daily
+    return _parse_due_datetime_cached(date_string, today)
+
+
+def _midnight(value: datetime):
+    """Drop the time of day, keeping the date as a datetime"""
+    return datetime.combine(value.date(), datetime.min.time())
+
+
+@lru_cache(maxsize=4096)
+def _parse_due_datetime_cached(date_string: str, today: date):
+    """Uncached body of parse_due_datetime, resolved relative to `today`."""
     # Normalize input
     date_string_lower = date_string.lower().strip()
-    now = datetime.now()
+    now = datetime.combine(today, datetime.min.time())
     current_weekday = now.weekday()  # Monday=0, Tuesday=1, ..., Sunday=6
     
-    # === WEEK-BASED PATTERNS ===
-    
-    # Pattern: "next week" or "beginning of next week"
-    if re.search(r'\b(next week|beginning of next week|start of next week)\b', date_string_lower):
-        days_until_next_monday = (7 - current_weekday) if current_weekday != 0 else 7
-        target_date = now + timedelta(days=days_until_next_monday)
-        return target_date.strftime("%Y-%m-%d")
-    
-    # Pattern: "end of next week"
-    if re.search(r'\bend of next week\b', date_string_lower):
-        days_until_next_monday = (7 - current_weekday) if current_weekday != 0 else 7
-        next_monday = now + timedelta(days=days_until_next_monday)
-        next_friday = next_monday + timedelta(days=4)  # Monday + 4 = Friday
-        return next_friday.strftime("%Y-%m-%d")
-    
-    # Pattern: "this week" or "beginning of this week"
-    if re.search(r'\b(this week|beginning of this week|start of this week)\b', date_string_lower):
-        if current_weekday == 0:  # Already Monday
-            target_date = now
-        else:
-            # Go back to this week's Monday
-            target_date = now - timedelta(days=current_weekday)
-        return target_date.strftime("%Y-%m-%d")
-    
-    # Pattern: "end of week" or "end of this week"
-    if re.search(r'\bend of (this )?week\b', date_string_lower):
-        if current_weekday <= 4:  # Monday to Friday
-            days_until_friday = 4 - current_weekday
-            target_date = now + timedelta(days=days_until_friday)
-        else:  # Saturday or Sunday - go to next Friday
-            days_until_next_monday = 7 - current_weekday
-            next_monday = now + timedelta(days=days_until_next_monday)
-            target_date = next_monday + timedelta(days=4)
-        return target_date.strftime("%Y-%m-%d")
-    
-    # Pattern: "in X weeks" → X weeks from today
-    weeks_match = re.search(r'\bin (\d+) weeks?\b', date_string_lower)
-    if weeks_match:
-        num_weeks = int(weeks_match.group(1))
-        target_date = now + timedelta(weeks=num_weeks)
-        return target_date.strftime("%Y-%m-%d")
-    
-    # === DAY-BASED PATTERNS ===
-    
-    # Map weekday names to numbers
-    weekday_map = {
-        'monday': 0, 'mon': 0,
-        'tuesday': 1, 'tue': 1, 'tues': 1,
-        'wednesday': 2, 'wed': 2,
-        'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
-        'friday': 4, 'fri': 4,
-        'saturday': 5, 'sat': 5,
-        'sunday': 6, 'sun': 6
-    }
+    # === WEEK- AND DAY-BASED PATTERNS ===
     
-    # Pattern: "next <weekday>" - go to the next occurrence of that weekday
-    for day_name, day_num in weekday_map.items():
-        if re.search(rf'\bnext {day_name}\b', date_string_lower):
-            days_ahead = (day_num - current_weekday) % 7
-            if days_ahead == 0:  # If today is that day, go to next week's instance
-                days_ahead = 7
-            target_date = now + timedelta(days=days_ahead)
-            return target_date.strftime("%Y-%m-%d")
-    
-    # Pattern: "this <weekday>" - go to this week's occurrence (or today if that day)
-    for day_name, day_num in weekday_map.items():
-        if re.search(rf'\bthis {day_name}\b', date_string_lower):
-            if current_weekday == day_num:
-                target_date = now
-            elif current_weekday < day_num:
-                days_ahead = day_num - current_weekday
-                target_date = now + timedelta(days=days_ahead)
-            else:  # Already passed that day this week
-                days_ahead = (7 - current_weekday) + day_num
-                target_date = now + timedelta(days=days_ahead)
-            return target_date.strftime("%Y-%m-%d")
+    match = DATE_PHRASE_PATTERN.search(date_string_lower)
+    if match:
+        target_date = DATE_PHRASE_HANDLERS[match.lastgroup](match, now, current_weekday)
+        return _midnight(target_date)
     
     # === STANDARD DATEPARSER ===
     
     # Let dateparser handle everything else
-    parsed_date = date_parse(
-        date_string,
-        settings={
-            'PREFER_DATES_FROM': 'future',
-            'RELATIVE_BASE': now,
-            'TIMEZONE': 'UTC',
-        }
-    )
+    parsed_date = DATE_PARSER.get_date_data(date_string).date_obj
     
     if parsed_date:
-        return parsed_date.strftime("%Y-%m-%d")
+        return _midnight(parsed_date)
     
     # Fallback: Try search_dates for embedded dates
-    dates = search_dates(date_string, settings={'PREFER_DATES_FROM': 'future'})
+    dates = search_dates(date_string, languages=['en'], settings={'PREFER_DATES_FROM': 'future'})
     if dates and len(dates) > 0:
-        return dates[0][1].strftime("%Y-%m-%d")
+        return _midnight(dates[0][1])
     
     return None
 
 
-
+def to_due_datetime(date_str):
+    """Convert a parsed "YYYY-MM-DD" date into the datetime stored in MongoDB"""
+    return datetime.strptime(date_str, "%Y-%m-%d")
 
 
 def get_weekday_name(date_str):
@@ -214,7 +371,7 @@ def mongo_collection():
 
 
 @server.tool(name="add_task", description="Add a new task with optional due date")
-def add_task(title: str, due_date: str = None):
+async def add_task(title: str, due_date: str = None):
     parsed_due_date = None
     if due_date:
         parsed_due_date = parse_due_date(due_date)
@@ -225,18 +382,18 @@ def add_task(title: str, due_date: str = None):
             }
         
     task = {
-        "id": get_next_task_id(),
+        "id": await get_next_task_id(),
         "title": title,
         "due_date": parsed_due_date,
         "done": False,
-        "created_at": datetime.now().isoformat(),
+        "created_at": now_iso(),
     }
     
-    tasks_collection.insert_one(task)
-
-    
-    # Remove MongoDB's _id from response
-    #task.pop("_id", None)
+    # Store a copy so insert_one's _id doesn't leak into the response
+    await tasks_collection.insert_one({
+        **task,
+        "due_date": to_due_datetime(parsed_due_date) if parsed_due_date else None
+    })
     
     return {
         "message": f"Task added: {title}",
@@ -245,55 +402,91 @@ def add_task(title: str, due_date: str = None):
     }
 
 
-@server.tool(name="delete_task", description="Delete a task by its ID")
-def delete_task(task_id: int):
-    try:
-        task_id = int(task_id)
-    except ValueError:
-        return {"error": "Task ID must be an integer."}
+@server.tool(name="add_tasks", description="Add several tasks at once, optionally sharing one due date")
+async def add_tasks(titles: list[str], due_date: str = None):
+    if not titles:
+        return {"error": "Provide at least one task title."}
     
-    task = tasks_collection.find_one({"id": task_id})
+    parsed_due_date = None
+    if due_date:
+        parsed_due_date = parse_due_date(due_date)
+        if not parsed_due_date:
+            return {
+                "error": f"Could not understand the due date: '{due_date}'. Try formats like '2025-10-15', 'tomorrow', 'next Monday', etc.",
+                "received_date": due_date
+            }
     
-    if task:
-        deleted_task = {
-            "id": task["id"],
-            "title": task["title"],
-            "due_date": task.get("due_date"),
-            "done": task.get("done"),
-            "created_at": task.get("created_at")
+    # One counter round-trip for the whole batch
+    first_id = await reserve_task_ids(len(titles))
+    created_at = now_iso()
+    tasks = [
+        {
+            "id": first_id + offset,
+            "title": title,
+            "due_date": parsed_due_date,
+            "done": False,
+            "created_at": created_at,
         }
-        tasks_collection.delete_one({"id": task_id})
+        for offset, title in enumerate(titles)
+    ]
+    
+    stored_due_date = to_due_datetime(parsed_due_date) if parsed_due_date else None
+    await tasks_collection.insert_many(
+        [{**task, "due_date": stored_due_date} for task in tasks],
+        ordered=False
+    )
+    
+    return {
+        "message": f"Added {len(tasks)} tasks",
+        "tasks": tasks,
+        "parsed_date": parsed_due_date if parsed_due_date else "No due date"
+    }
+
+
+@server.tool(name="delete_task", description="Delete a task by its ID")
+async def delete_task(task_id: int):
+    # Delete and return the document in a single round-trip
+    task = await tasks_collection.find_one_and_delete({"id": task_id}, projection=TASK_PROJECTION)
+    
+    if task:
         return {
-            "message": f"Task '{deleted_task['title']}' (ID: {task_id}) has been deleted.",
-            "deleted_task": deleted_task
+            "message": f"Task '{task['title']}' (ID: {task_id}) has been deleted.",
+            "deleted_task": task
         }
     
     return {"error": f"Task with ID {task_id} not found."}
 
 
-@server.tool(name="list_tasks", description="List all existing tasks.")
-def list_tasks():
-    tasks = list(tasks_collection.find({}, {"_id": 0}).sort("id", 1))
+@server.tool(name="list_tasks", description="List existing tasks, paged with skip/limit (default first 100). Set include_timestamps to also get created/completed times.")
+async def list_tasks(skip: int = 0, limit: int = 100, include_timestamps: bool = False):
+    projection = TASK_PROJECTION if include_timestamps else TASK_LIST_PROJECTION
+    cursor = tasks_collection.find({}, projection).sort("id", 1).skip(skip).limit(limit)
+    tasks, total_count = await asyncio.gather(
+        cursor.to_list(length=None),
+        tasks_collection.count_documents({})
+    )
     return {
         "tasks": tasks,
-        "total_count": len(tasks)
+        "total_count": total_count
     }
 
 
 @server.tool(name="complete_task", description="Mark a task as completed by its ID.")
-def complete_task(task_id: int):
-    result = tasks_collection.update_one(
+async def complete_task(task_id: int):
+    # Update and return the updated document in a single round-trip
+    task = await tasks_collection.find_one_and_update(
         {"id": task_id},
         {
             "$set": {
                 "done": True,
-                "completed_at": datetime.now().isoformat()
+                "completed_at": now_iso()
             }
-        }
+        },
+        projection=TASK_PROJECTION,
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.matched_count > 0:
-        task = tasks_collection.find_one({"id": task_id}, {"_id": 0})
+    if task:
         return {
             "message": f"Task '{task['title']}' (ID: {task_id}) marked as done.",
             "task": task
@@ -302,29 +495,39 @@ def complete_task(task_id: int):
     return {"error": f"Task with ID {task_id} not found."}
 
 
-@server.tool(name="summarize_tasks", description="Summarize pending and completed tasks.")
-def summarize_tasks():
-    all_tasks = list(tasks_collection.find({}, {"_id": 0}))
-    done = [t for t in all_tasks if t.get("done")]
-    pending = [t for t in all_tasks if not t.get("done")]
-    
-    # Count overdue tasks
-    today = datetime.now().strftime("%Y-%m-%d")
-    overdue = [t for t in pending if t.get("due_date") and t["due_date"] < today]
-    
-    summary = f"You have {len(pending)} pending and {len(done)} completed tasks."
+@server.tool(name="summarize_tasks", description="Summarize pending and completed tasks (lists pending and overdue tasks, counts completed ones).")
+async def summarize_tasks():
+    # Midnight today: anything due before it is overdue
+    today = datetime.combine(date.today(), datetime.min.time())
+    
+    # Split pending/overdue and count completed server-side in a single round-trip
+    pipeline = [{"$facet": {
+        "pending": [{"$match": {"done": {"$ne": True}}}, {"$project": TASK_PROJECTION}],
+        "overdue": [
+            {"$match": {"done": {"$ne": True}, "due_date": {"$lt": today}}},
+            {"$project": TASK_PROJECTION}
+        ],
+        "counts": [{"$group": {"_id": {"$eq": ["$done", True]}, "n": {"$sum": 1}}}],
+    }}]
+    cursor = await tasks_collection.aggregate(pipeline)
+    result = (await cursor.to_list(length=None))[0]
+    pending = result["pending"]
+    overdue = result["overdue"]
+    counts = {group["_id"]: group["n"] for group in result["counts"]}
+    completed_count = counts.get(True, 0)
+    
+    summary = f"You have {len(pending)} pending and {completed_count} completed tasks."
     if overdue:
         summary += f" {len(overdue)} tasks are overdue."
     
     return {
         "summary": summary,
         "pending": pending,
-        "completed": done,
         "overdue": overdue,
         "stats": {
-            "total": len(all_tasks),
+            "total": len(pending) + completed_count,
             "pending": len(pending),
-            "completed": len(done),
+            "completed": completed_count,
             "overdue": len(overdue)
         }
     }
@@ -334,22 +537,22 @@ def summarize_tasks():
     "tasks_by_date",
     description="List tasks for a specific date (supports natural language like 'tomorrow', 'next Monday')."
 )
-def tasks_by_date(date: str):
+async def tasks_by_date(date: str):
     # Parse date from natural language
-    parsed_due_date = parse_due_date(date)
-    if not parsed_due_date:
+    parsed_date = parse_due_datetime(date)
+    if not parsed_date:
         return {
             "error": f"Could not understand the date: '{date}'. Use YYYY-MM-DD or natural language like 'tomorrow', 'next Monday'.",
             "received_date": date
         }
     
-    tasks_for_date = list(tasks_collection.find(
-        {"due_date": parsed_due_date},
-        {"_id": 0}
-    ))
+    tasks_for_date = await tasks_collection.find(
+        {"due_date": parsed_date},
+        TASK_PROJECTION
+    ).to_list(length=None)
     
     return {
-        "date": parsed_due_date,
+        "date": format_due_date(parsed_date),
         "date_input": date,
         "tasks": tasks_for_date,
         "count": len(tasks_for_date)
@@ -361,18 +564,20 @@ def tasks_by_date(date: str):
     name="tasks_by_range",
     description="List tasks within a date range. Supports natural language like 'this week', 'next 7 days', or specific dates like '2025-10-20 to 2025-10-25'."
 )
-def tasks_by_range(start: str, end: str = None):
+async def tasks_by_range(start: str, end: str = None, skip: int = 0, limit: int = 100):
     """
     Get tasks within a date range.
     
     Args:
         start: Start date (natural language or YYYY-MM-DD)
         end: End date (optional, defaults to same as start for single day)
+        skip: Number of matching tasks to skip (for paging)
+        limit: Maximum number of tasks to return
     """
-    # Use custom parse_due_date (no settings parameter!)
-    start_date_str = parse_due_date(start)
+    # Parse straight to datetimes for the query and comparison
+    parsed_start = parse_due_datetime(start)
     
-    if not start_date_str:
+    if not parsed_start:
         return {
             "error": f"Could not understand start date: '{start}'. Try '2025-10-20', 'today', 'tomorrow', etc.",
             "received_start": start
@@ -380,43 +585,46 @@ def tasks_by_range(start: str, end: str = None):
 
     # Parse end date
     if end:
-        end_date_str = parse_due_date(end)
-        if not end_date_str:
+        parsed_end = parse_due_datetime(end)
+        if not parsed_end:
             return {
                 "error": f"Could not understand end date: '{end}'. Try '2025-10-25', 'next week', etc.",
                 "received_end": end
             }
     else:
         # If no end date, assume single day (same as start)
-        end_date_str = start_date_str
-
-    # Convert strings to datetime objects for comparison
-    parsed_start = datetime.strptime(start_date_str, "%Y-%m-%d")
-    parsed_end = datetime.strptime(end_date_str, "%Y-%m-%d")
+        parsed_end = parsed_start
 
     # Ensure start is before or equal to end
     if parsed_start > parsed_end:
         parsed_start, parsed_end = parsed_end, parsed_start
-        start_date_str, end_date_str = end_date_str, start_date_str
 
     # Filter tasks within the date range using MongoDB query
-    tasks_in_range = list(tasks_collection.find(
-        {
-            "due_date": {
-                "$gte": start_date_str,
-                "$lte": end_date_str
-            }
-        },
-        {"_id": 0}
-    ))
+    range_filter = {
+        "due_date": {
+            "$gte": parsed_start,
+            "$lte": parsed_end
+        }
+    }
+    # Stable order so skip/limit pages don't overlap
+    cursor = (
+        tasks_collection.find(range_filter, TASK_PROJECTION)
+        .sort([("due_date", 1), ("id", 1)])
+        .skip(skip)
+        .limit(limit)
+    )
+    tasks_in_range, count = await asyncio.gather(
+        cursor.to_list(length=None),
+        tasks_collection.count_documents(range_filter)
+    )
 
     return {
-        "start_date": start_date_str,
-        "end_date": end_date_str,
+        "start_date": format_due_date(parsed_start),
+        "end_date": format_due_date(parsed_end),
         "start_input": start,
         "end_input": end if end else "same as start",
         "tasks": tasks_in_range,
-        "count": len(tasks_in_range),
+        "count": count,
         "date_range_days": (parsed_end - parsed_start).days + 1
     }
 
@@ -1,54 +1,146 @@
-import json
+import atexit
+import orjson
 import os
+import sys
+import threading
+import uuid
+from collections import deque
 from dotenv import load_dotenv
 from datetime import datetime
 from mcp.server.fastmcp import FastMCP
+from file_lock import locked
 from pathlib import Path
+from timestamps import now_iso
 
 load_dotenv()
 
 server = FastMCP(name="DesktopNotificationServer")
 
-# Shared notification storage
-NOTIFICATIONS_FILE = Path(__file__).parent / "notifications.json"
+# Shared notification storage: an append-only journal, one JSON object per line.
+# The old notifications.json array format is not read or migrated.
+NOTIFICATIONS_FILE = Path(__file__).parent / "notifications.jsonl"
+# Every API worker runs its own copy of this server, so appends and
+# compaction are serialized across processes with this lock file
+NOTIFICATIONS_LOCK_FILE = NOTIFICATIONS_FILE.with_suffix(".jsonl.lock")
 MAX_HISTORY = 100
+# Rewrite the journal down to MAX_HISTORY lines after this many appends
+COMPACT_EVERY = 50
 
+NOTIFICATION_ICONS = {
+    "info": "ℹ️",
+    "success": "✅",
+    "warning": "⚠️",
+    "error": "❌"
+}
 
-def add_to_history(notification_type, title, message):
-    """Add notification to shared history file"""
-    try:
-        # Load existing notifications
-        if NOTIFICATIONS_FILE.exists():
-            with open(NOTIFICATIONS_FILE, 'r') as f:
-                notifications = json.load(f)
-        else:
-            notifications = []
+PRIORITY_ICONS = {
+    "low": "🔵",
+    "normal": "🟡",
+    "high": "🔴"
+}
+
+# Buffered appends are written together this many seconds after the first one
+FLUSH_DELAY = 0.5
+
+# Guards _pending/_flush_timer; held only briefly, never across file I/O
+_history_lock = threading.Lock()
+# Serializes flushes within this process (timer thread and atexit), in order
+_flush_lock = threading.Lock()
+_pending = []
+_flush_timer = None
+_appends_since_compact = 0
+
+
+def read_history():
+    """Return the last MAX_HISTORY journal entries, oldest first"""
+    if not NOTIFICATIONS_FILE.exists():
+        return []
+    
+    with open(NOTIFICATIONS_FILE, 'rb') as f:
+        lines = deque(f, maxlen=MAX_HISTORY)
+    
+    entries = []
+    for line in lines:
+        try:
+            entry = orjson.loads(line)
+        except ValueError:
+            continue  # Skip a blank or partially written line
+        # Skip anything that isn't a notification object, like a legacy "[]"
+        if isinstance(entry, dict):
+            entries.append(entry)
+    return entries
+
+
+def compact_history():
+    """Atomically rewrite the journal with only the last MAX_HISTORY entries; callers hold the journal lock"""
+    entries = read_history()
+    tmp_file = NOTIFICATIONS_FILE.with_suffix(".jsonl.tmp")
+    with open(tmp_file, 'wb') as f:
+        f.writelines(orjson.dumps(entry) + b"\n" for entry in entries)
+        # Make sure the data is on disk before the rename publishes it
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, NOTIFICATIONS_FILE)
+
+
+def flush_history():
+    """Append all buffered notifications to the journal in a single write"""
+    global _pending, _flush_timer, _appends_since_compact
+    with _flush_lock:
+        # Only swap the buffer under _history_lock, so tool calls never wait on file I/O
+        with _history_lock:
+            _flush_timer = None
+            batch, _pending = _pending, []
+        if not batch:
+            return
         
-        # Add new notification
-        notifications.insert(0, {
-            "id": len(notifications) + 1,
+        try:
+            with locked(NOTIFICATIONS_LOCK_FILE):
+                with open(NOTIFICATIONS_FILE, 'ab') as f:
+                    f.writelines(orjson.dumps(entry) + b"\n" for entry in batch)
+                _appends_since_compact += len(batch)
+                
+                # Keep only last MAX_HISTORY notifications, amortized over appends
+                if _appends_since_compact >= COMPACT_EVERY:
+                    compact_history()
+                    _appends_since_compact = 0
+        except Exception as e:
+            # stdout carries the MCP stdio protocol, so report on stderr
+            print(f"Failed to save notification: {e}", file=sys.stderr)
+            # Put the batch back ahead of newer notifications for the next flush
+            with _history_lock:
+                _pending[:0] = batch
+
+
+def add_to_history(notification_type, title, message):
+    """Buffer a notification; a timer flushes the buffer to the journal"""
+    global _flush_timer
+    now = datetime.now()
+    with _history_lock:
+        _pending.append({
+            # Random ids can't collide between server processes
+            "id": uuid.uuid4().hex,
             "type": notification_type,
             "title": title,
             "message": message,
-            "timestamp": datetime.now().isoformat(),
-            "time": datetime.now().strftime("%I:%M:%S %p")
+            "timestamp": now.isoformat(),
+            "time": now.strftime("%I:%M:%S %p")
         })
         
-        # Keep only last MAX_HISTORY notifications
-        notifications = notifications[:MAX_HISTORY]
-        
-        # Save back to file
-        with open(NOTIFICATIONS_FILE, 'w') as f:
-            json.dump(notifications, f, indent=2)
-    except Exception as e:
-        print(f"Failed to save notification: {e}")
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(FLUSH_DELAY, flush_history)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+atexit.register(flush_history)
 
 
 @server.tool(
     name="send_desktop_notification",
     description="Show a desktop notification pop-up on your laptop. Works on Windows, Mac, and Linux."
 )
-def send_desktop_notification(
+async def send_desktop_notification(
     title: str,
     message: str,
     timeout: int = 10,
@@ -65,7 +157,7 @@ def send_desktop_notification(
             "details": {
                 "title": title,
                 "message": message,
-                "sent_at": datetime.now().isoformat()
+                "sent_at": now_iso()
             }
         }
     except Exception as e:
@@ -79,7 +171,7 @@ def send_desktop_notification(
     name="send_notification",
     description="Send a formatted notification with different types (info, success, warning, error)."
 )
-def send_notification(
+async def send_notification(
     title: str,
     message: str,
     notification_type: str = "info",
@@ -88,16 +180,11 @@ def send_notification(
     """
     Store a formatted notification for the browser dashboard (no OS pop-up).
     """
-    icons = {
-        "info": "ℹ️",
-        "success": "✅",
-        "warning": "⚠️",
-        "error": "❌"
-    }
-    icon = icons.get(notification_type.lower(), icons["info"])
+    normalized_type = notification_type.lower()
+    icon = NOTIFICATION_ICONS.get(normalized_type, NOTIFICATION_ICONS["info"])
     formatted_title = f"{icon} {title}"
     try:
-        add_to_history(notification_type.lower(), title, message)
+        add_to_history(normalized_type, title, message)
         return {
             "success": True,
             "message": "✅ Notification stored for browser dashboard!",
@@ -105,7 +192,7 @@ def send_notification(
                 "title": formatted_title,
                 "message": message,
                 "type": notification_type,
-                "sent_at": datetime.now().isoformat()
+                "sent_at": now_iso()
             }
         }
     except Exception as e:
@@ -119,7 +206,7 @@ def send_notification(
     name="send_task_reminder",
     description="Send a task reminder notification."
 )
-def send_task_reminder(
+async def send_task_reminder(
     task_name: str,
     due_time: str = None,
     priority: str = "normal"
@@ -127,12 +214,7 @@ def send_task_reminder(
     """
     Store a task reminder notification for the browser dashboard (no OS pop-up).
     """
-    priority_icons = {
-        "low": "🔵",
-        "normal": "🟡",
-        "high": "🔴"
-    }
-    icon = priority_icons.get(priority.lower(), "🟡")
+    icon = PRIORITY_ICONS.get(priority.lower(), PRIORITY_ICONS["normal"])
     message = f"Task: {task_name}"
     if due_time:
         message += f"\nDue: {due_time}"
@@ -145,7 +227,7 @@ def send_task_reminder(
             "details": {
                 "title": title,
                 "message": message,
-                "sent_at": datetime.now().isoformat()
+                "sent_at": now_iso()
             }
         }
     except Exception as e:
@@ -159,7 +241,7 @@ def send_task_reminder(
     name="send_urgent_alert",
     description="Send an urgent alert that stays visible longer."
 )
-def send_urgent_alert(
+async def send_urgent_alert(
     title: str,
     message: str
 ):
@@ -174,7 +256,7 @@ def send_urgent_alert(
             "details": {
                 "title": f"🚨 URGENT: {title}",
                 "message": message,
-                "sent_at": datetime.now().isoformat()
+                "sent_at": now_iso()
             }
         }
     except Exception as e:
@@ -188,7 +270,7 @@ def send_urgent_alert(
     name="test_notification",
     description="Test if desktop notifications are working."
 )
-def test_notification():
+async def test_notification():
     """Test browser notification system (stores a test notification)."""
     try:
         add_to_history("info", "🎉 Notification Test", "If you see this in your dashboard, your browser notification system is working!")
@@ -0,0 +1,16 @@
+import time
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=2)
+def _iso_for_second(second: int):
+    return datetime.fromtimestamp(second).isoformat()
+
+
+def now_iso():
+    """Current local time as an ISO string, at one-second resolution.
+
+    Calls within the same second share one formatted string.
+    """
+    return _iso_for_second(int(time.time()))
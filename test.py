@@ -34,10 +34,12 @@ if not mailtrap_token:
 try:
     url = "https://send.api.mailtrap.io/api/send"
     
-    headers = {
+    # One session keeps the connection alive and holds the auth headers
+    session = requests.Session()
+    session.headers.update({
         "Authorization": f"Bearer {mailtrap_token}",
         "Content-Type": "application/json"
-    }
+    })
     
     # Change this to YOUR email address to receive the test
     test_recipient = input("Enter your email address to receive test: ").strip()
@@ -56,7 +58,7 @@ try:
             }
         ],
         "subject": "🎉 Mailtrap Test - Configuration Successful!",
-        "html": """
+        "html": f"""
             <html>
                 <body style="font-family: Arial, sans-serif; padding: 20px;">
                     <div style="max-width: 600px; margin: 0 auto;">
@@ -93,7 +95,7 @@ try:
     print(f"Sending test email to: {test_recipient}")
     print("Please wait...")
     
-    response = requests.post(url, json=payload, headers=headers, timeout=30)
+    response = session.post(url, json=payload, timeout=30)
     
     print()
     if response.status_code == 200: